@@ -1,5 +1,5 @@
 # app.py
-import os, sys
+import os, sys, time
 from datetime import datetime
 
 # Ensure we can import from ./src even on HF Spaces
@@ -12,9 +12,18 @@ import pandas as pd
 # Your local modules
 from data import load_statcast, default_window
 from featurize import infer_ivb_sign, engineer_pitch_features
-from model import fit_kmeans, nearest_comps
+from model import fit_kmeans, fit_neighbors, nearest_comps
 from tags import xy_cluster_tags
 from plots import movement_scatter_xy, radar_quality
+from store import (
+    publish_frames,
+    read_manifest,
+    default_manifest,
+    stored_path,
+    map_frame,
+    fit_frame_name,
+)
+from refresh import RefreshWorker
 
 try:
     from huggingface_hub import hf_hub_download
@@ -29,11 +38,11 @@ st.title("⚾ PitchXY — Handedness-Aware Pitch Archetypes & Scouting Cards")
 # ---- Helpers
 
 
-@st.cache_data(show_spinner=False, ttl=24 * 3600)
 def load_statcast_cached(start: str, end: str, force: bool = False) -> pd.DataFrame:
     """
-    Cached wrapper around your loader. On Spaces, expensive network calls during
-    app init are the #1 cause of infinite 'Starting...'. This keeps it fast.
+    Wrapper around your loader. The parquet cache on disk avoids repeat network
+    calls; the raw frame is deliberately not kept in memory, since it is only
+    needed once to (re)build the shared feature store below.
     """
     return load_statcast(start, end, force=force)
 
@@ -80,19 +89,70 @@ def load_sample_fallback() -> pd.DataFrame:
     )
 
 
-def safe_load_data(start: str, end: str, force: bool) -> pd.DataFrame:
+def safe_load_data(start: str, end: str, force: bool) -> tuple[pd.DataFrame, bool]:
     """
     Try cached real data first; if it errors or returns empty, fall back to a sample.
+    Returns (df, is_live) so sample data never gets published to the feature store.
     """
     try:
         df = load_statcast_cached(start, end, force)
         # Basic sanity check – empty windows are common; handle gracefully
         if df is not None and not df.empty:
-            return df
+            return df, True
         st.info("No live data returned for that window — showing sample data instead.")
     except Exception as e:
         st.warning(f"Live data failed: {e}\nUsing sample data instead.")
-    return load_sample_fallback()
+    return load_sample_fallback(), False
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _map_stored(path: str) -> pd.DataFrame:
+    """
+    One read-only mapping per stored file per process, shared by all sessions
+    (cache_resource hands out the same object instead of pickled copies).
+    Stored files are immutable, so the path is a complete cache key.
+    """
+    return map_frame(path)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _stored_neighbors(path: str):
+    return fit_neighbors(_map_stored(path))
+
+
+def _publish_and_map(
+    start: str, end: str, frames: dict, replace: bool = False, build=None
+) -> dict:
+    """Publish freshly built frames and hand back the mapped views of them."""
+    try:
+        manifest = publish_frames(start, end, frames, replace=replace, build=build)
+    except OSError as e:
+        st.warning(f"Feature store not writable ({e}); using an in-session copy.")
+        return frames
+    if manifest is None:  # data was rebuilt meanwhile; serve ours this run
+        return frames
+    mapped = {}
+    for name, df in frames.items():
+        # a concurrent rebuild may already have pruned what we just published
+        path = stored_path(start, end, name, manifest)
+        mapped[name] = df if path is None else _map_stored(str(path))
+    return mapped
+
+
+@st.cache_resource(show_spinner=False)
+def _refresh_worker() -> RefreshWorker:
+    """One background rebuilder per process for the default window (k=8)."""
+    return RefreshWorker(default_window, k=8)
+
+
+def _wait_for_first_snapshot(start: str, worker: RefreshWorker, timeout=600):
+    deadline = time.time() + timeout
+    while time.time() < deadline and worker.last_error is None:
+        latest = default_manifest(start)
+        if latest is not None:
+            return latest
+        time.sleep(2)
+    return default_manifest(start)
 
 
 # ---- Sidebar
@@ -106,29 +166,36 @@ with st.sidebar:
     force = st.checkbox("Force re-download (discouraged on Spaces)", value=False)
     st.caption("Tip: avoid 'Force re-download' on Spaces to keep startup snappy.")
 
-# ---- Data pipeline
+# "Force re-download" acts once when ticked for a window, not on every rerun
+# (pitcher/tab changes) while the box stays ticked.
+force_now = force and st.session_state.get("force_done") != (start, end)
+st.session_state["force_done"] = (start, end) if force else None
 
-with st.spinner("Loading data…"):
-    df_raw = safe_load_data(start, end, force)
-
-if df_raw.empty:
-    st.warning(
-        "No data available (live and sample were both empty). "
-        "Upload a small sample file to ./data/sample_statcast.parquet or set "
-        "env vars SAMPLE_DATA_REPO + SAMPLE_DATA_FILE to a HF dataset."
-    )
-    st.stop()
+# ---- Data pipeline
 
 
-# Feature engineering (cache stable steps)
-@st.cache_data(show_spinner=False)
 def _featurize(df_raw_in: pd.DataFrame):
     ivb_sign = infer_ivb_sign(df_raw_in)
     df_feat_local = engineer_pitch_features(df_raw_in, ivb_sign)
     return df_feat_local
 
 
-df_feat = _featurize(df_raw)
+def _load_and_featurize(start: str, end: str, force: bool = False):
+    """Store-miss path: raw load + featurize; the raw frame is dropped here."""
+    df_raw, is_live = safe_load_data(start, end, force)
+    if df_raw.empty:
+        return None, is_live
+    return _featurize(df_raw), is_live
+
+
+@st.cache_data(show_spinner=False, ttl=24 * 3600)
+def _build_features(start: str, end: str):
+    """
+    Cached on the window so sample data (never published) or an unwritable
+    store don't redo the load every rerun. Only the small feature frame is
+    cached. Forced re-downloads bypass this (see below).
+    """
+    return _load_and_featurize(start, end)
 
 
 @st.cache_data(show_spinner=False)
@@ -140,8 +207,81 @@ def _fit_model(df_feat_in: pd.DataFrame, k_val: int):
     return df_fit_local, scaler, km, nn
 
 
-with st.spinner("Clustering & tagging…"):
-    df_fit, scaler, km, nn = _fit_model(df_feat, k)
+# The default window is served stale-while-revalidate: the last good snapshot
+# stays up while the background worker rebuilds it (daily, or on "Force
+# re-download"), and the next rerun picks up the new manifest once published.
+worker = None
+store_end = end
+if (start, end) == (dstart, dend):
+    worker = _refresh_worker()
+    if force_now:
+        worker.request(force=True)
+    latest = default_manifest(start)
+    # an exact-window snapshot (e.g. from the CLI) is served right away; the
+    # worker adopts it as the default on its next pass
+    manifest = None if latest else read_manifest(start, end)
+    if latest is None and manifest is None and worker.last_error is None:
+        with st.spinner("Building the first data snapshot…"):
+            latest = _wait_for_first_snapshot(start, worker)
+    if latest is not None:
+        store_end, manifest = latest
+    elif manifest is None:
+        # worker failed: fall back to anything built in-session for this window
+        manifest = read_manifest(start, end)
+        if worker.last_error:
+            st.warning(f"Background refresh failed: {worker.last_error}")
+    if manifest is not None:
+        force_now = False  # the worker owns re-downloads for this window
+else:
+    manifest = None if force_now else read_manifest(start, end)
+
+if manifest and "as_of" in manifest:
+    as_of = datetime.fromisoformat(manifest["as_of"]).strftime("%Y-%m-%d %H:%M UTC")
+    stamp = f"Data as of {as_of} ({start} → {store_end})"
+    if worker is not None and worker.running:
+        stamp += " — refreshing in the background…"
+    st.caption(stamp)
+
+# Feature store first (written by the CLI, the refresh worker or an earlier
+# session); the raw pitch-level frame is only loaded when nothing is stored.
+feat_path = stored_path(start, store_end, "feat", manifest) if manifest else None
+is_live = True
+if feat_path is not None:
+    df_feat = _map_stored(str(feat_path))
+else:
+    with st.spinner("Loading data…"):
+        if force_now:
+            # never served from the cache; drop stale entries built before it
+            df_feat, is_live = _load_and_featurize(start, end, force=True)
+            _build_features.clear()
+        else:
+            df_feat, is_live = _build_features(start, end)
+
+    if df_feat is None:
+        st.warning(
+            "No data available (live and sample were both empty). "
+            "Upload a small sample file to ./data/sample_statcast.parquet or set "
+            "env vars SAMPLE_DATA_REPO + SAMPLE_DATA_FILE to a HF dataset."
+        )
+        st.stop()
+
+    store_end = end
+    if is_live:
+        df_feat = _publish_and_map(start, end, {"feat": df_feat}, replace=True)["feat"]
+        manifest = read_manifest(start, end)
+
+fit_name = fit_frame_name(k)
+fit_path = stored_path(start, store_end, fit_name, manifest) if feat_path else None
+if fit_path is not None:
+    df_fit = _map_stored(str(fit_path))
+    scaler, nn = _stored_neighbors(str(fit_path))
+else:
+    with st.spinner("Clustering & tagging…"):
+        df_fit, scaler, km, nn = _fit_model(df_feat, k)
+    if is_live:
+        build = manifest.get("build") if manifest else None
+        published = _publish_and_map(start, store_end, {fit_name: df_fit}, build=build)
+        df_fit = published[fit_name]
 
 # ---- UI
 
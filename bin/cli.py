@@ -1,10 +1,11 @@
 from __future__ import annotations
 import argparse
-from data import load_statcast, default_window
-from featurize import infer_ivb_sign, engineer_pitch_features
+from data import load_statcast, statcast_cache_path, default_window
+from featurize import infer_ivb_sign, engineer_pitch_features, stream_pitch_features
 from model import fit_kmeans, nearest_comps
 from tags import xy_cluster_tags
 from plots import movement_scatter_xy
+from store import publish_frames, fit_frame_name
 from utils import ensure_dirs, ARTIFACTS_DIR
 import plotly.io as pio
 
@@ -25,6 +26,14 @@ def main():
     parser.add_argument(
         "--force", action="store_true", help="Force re-download Statcast"
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Featurize the cached parquet in batches (bounded memory)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=65_536, help="Rows per batch with --stream"
+    )
     args = parser.parse_args()
 
     ensure_dirs()
@@ -33,11 +42,16 @@ def main():
     )
     print(f"Window: {start} → {end}")
 
-    df_raw = load_statcast(start, end, force=args.force)
-    ivb_sign = infer_ivb_sign(df_raw)
+    if args.stream:
+        cp = statcast_cache_path(start, end, force=args.force)
+        df_feat, ivb_sign = stream_pitch_features(cp, batch_size=args.batch_size)
+    else:
+        df_raw = load_statcast(start, end, force=args.force)
+        ivb_sign = infer_ivb_sign(df_raw)
+        df_feat = engineer_pitch_features(df_raw, ivb_sign)
+        del df_raw
     print(f"IVB sign inferred = {ivb_sign} (ride should be positive)")
 
-    df_feat = engineer_pitch_features(df_raw, ivb_sign)
     df_fit, scaler, km, nn = fit_kmeans(df_feat, k=args.k)
     cluster_names = xy_cluster_tags(df_fit)
     df_fit["cluster_name"] = df_fit["cluster"].map(cluster_names)
@@ -49,6 +63,16 @@ def main():
     df_fit.to_parquet(fit_p, index=False)
     print(f"Saved: {feat_p}, {fit_p}")
 
+    # Shared feature store: the app maps these read-only instead of rebuilding
+    manifest = publish_frames(
+        start,
+        end,
+        {"feat": df_feat, fit_frame_name(args.k): df_fit},
+        replace=True,
+        ivb_sign=ivb_sign,
+    )
+    print(f"Published feature store snapshot {manifest['version']} for {start} → {end}")
+
     # Optional pitcher card + comps
     if args.pitcher:
         sub = df_fit[
@@ -1,10 +1,16 @@
 from __future__ import annotations
+import os
+import uuid
 from datetime import date
 from pathlib import Path
 import pandas as pd
+import pyarrow.parquet as pq
 from pybaseball import statcast
 from utils import CACHE_DIR
 
+# Small row groups let featurize.stream_pitch_features read the cache in bounded chunks
+CACHE_ROW_GROUP_SIZE = 100_000
+
 
 def default_window() -> tuple[str, str]:
     today = date.today()
@@ -24,6 +30,42 @@ def load_statcast(start_date: str, end_date: str, force: bool = False) -> pd.Dat
     df = statcast(start_dt=start_date, end_dt=end_date)
     if "pitch_type" in df.columns:
         df = df[df["pitch_type"].notna()]
-    df.to_parquet(cp, index=False)
+    df.to_parquet(cp, index=False, row_group_size=CACHE_ROW_GROUP_SIZE)
     return df
 
+
+def _rechunk_cache(cp: Path) -> None:
+    """
+    Rewrite a cache that has row groups larger than CACHE_ROW_GROUP_SIZE.
+    Caches written before that setting use pyarrow's default (~1M rows, i.e. a
+    whole season in one group), and parquet batch reads load a full row group,
+    so streaming them would still scale with history. The rewrite is one-off
+    and holds a single legacy row group in memory at a time.
+    """
+    pf = pq.ParquetFile(cp)
+    meta = pf.metadata
+    if all(
+        meta.row_group(i).num_rows <= CACHE_ROW_GROUP_SIZE
+        for i in range(meta.num_row_groups)
+    ):
+        return
+    # unique temp name: a CLI --stream run and an app's refresh worker may
+    # rewrite the same legacy cache at once; os.replace keeps either result
+    tmp = cp.with_name(f"{cp.name}.{uuid.uuid4().hex}.tmp")
+    with pq.ParquetWriter(tmp, pf.schema_arrow) as writer:
+        for i in range(meta.num_row_groups):
+            writer.write_table(
+                pf.read_row_group(i), row_group_size=CACHE_ROW_GROUP_SIZE
+            )
+    os.replace(tmp, cp)
+
+
+def statcast_cache_path(start_date: str, end_date: str, force: bool = False) -> Path:
+    """Ensure the window is cached on disk and return its parquet path (for streaming)."""
+    cp = _cache_path(start_date, end_date)
+    if force or not cp.exists():
+        load_statcast(start_date, end_date, force=force)
+    else:
+        _rechunk_cache(cp)
+    return cp
+
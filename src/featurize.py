@@ -1,6 +1,8 @@
 from __future__ import annotations
+from pathlib import Path
 import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 
 INCHES_PER_FOOT = 12.0
 
@@ -32,28 +34,56 @@ def _safe_rate(num, den):
     )
 
 
-def engineer_pitch_features(df: pd.DataFrame, ivb_sign: int) -> pd.DataFrame:
-    cols = [
-        "pitch_type",
-        "player_name",
-        "game_date",
-        "events",
-        "description",
-        "p_throws",
-        "stand",
-        "release_pos_x",
-        "release_pos_z",
-        "pfx_x",
-        "pfx_z",
-        "release_speed",
-        "release_spin_rate",
-        "plate_x",
-        "plate_z",
-        "zone",
-    ]
-    have = [c for c in cols if c in df.columns]
-    df = df[have].copy()
+FEATURE_COLS = [
+    "pitch_type",
+    "player_name",
+    "game_date",
+    "events",
+    "description",
+    "p_throws",
+    "stand",
+    "release_pos_x",
+    "release_pos_z",
+    "pfx_x",
+    "pfx_z",
+    "release_speed",
+    "release_spin_rate",
+    "plate_x",
+    "plate_z",
+    "zone",
+]
+GROUP_KEYS = ["player_name", "pitch_type", "p_throws"]
 
+# aggregate name -> per-pitch column; means for movement/stuff, sums for outcomes
+_MEAN_COLS = {
+    "velo": "release_speed",
+    "spin": "release_spin_rate",
+    "ivb_in": "ivb_in",
+    "hb_as_in": "hb_as_in",
+    "rel_height": "release_pos_z",
+    "rel_side": "release_pos_x",
+}
+_SUM_COLS = {
+    "cs": "is_called_strike",
+    "swings": "is_swing",
+    "whiffs": "is_whiff",
+    "inplay": "is_in_play",
+    "gb": "is_gb",
+}
+# only what the aggregates need (streaming reads skip everything else)
+_STREAM_COLS = GROUP_KEYS + [
+    "description",
+    "events",
+    "pfx_x",
+    "pfx_z",
+    "release_speed",
+    "release_spin_rate",
+    "release_pos_x",
+    "release_pos_z",
+]
+
+
+def _add_pitch_flags(df: pd.DataFrame, ivb_sign: int) -> pd.DataFrame:
     # outcomes
     df["is_called_strike"] = (df["description"] == "called_strike").astype(int)
     df["is_swing"] = (
@@ -77,23 +107,10 @@ def engineer_pitch_features(df: pd.DataFrame, ivb_sign: int) -> pd.DataFrame:
     df["hb_in_raw"] = df["pfx_x"] * INCHES_PER_FOOT
     df["ivb_in"] = ivb_sign * df["pfx_z"] * INCHES_PER_FOOT  # + = ride, − = drop
     df["hb_as_in"] = signed_arm_side(df["hb_in_raw"], df.get("p_throws"))
+    return df
 
-    grp = df.groupby(["player_name", "pitch_type", "p_throws"], as_index=False)
-    agg = grp.agg(
-        n=("pitch_type", "size"),
-        velo=("release_speed", "mean"),
-        spin=("release_spin_rate", "mean"),
-        ivb_in=("ivb_in", "mean"),
-        hb_as_in=("hb_as_in", "mean"),
-        rel_height=("release_pos_z", "mean"),
-        rel_side=("release_pos_x", "mean"),
-        cs=("is_called_strike", "sum"),
-        swings=("is_swing", "sum"),
-        whiffs=("is_whiff", "sum"),
-        inplay=("is_in_play", "sum"),
-        gb=("is_gb", "sum"),
-    )
 
+def _finalize_features(agg: pd.DataFrame) -> pd.DataFrame:
     agg["csw"] = _safe_rate(agg["cs"] + agg["whiffs"], agg["n"])
     agg["whiff_rate"] = _safe_rate(agg["whiffs"], agg["swings"])
     agg["gb_rate"] = _safe_rate(agg["gb"], agg["inplay"])
@@ -116,3 +133,107 @@ def engineer_pitch_features(df: pd.DataFrame, ivb_sign: int) -> pd.DataFrame:
         "zone_pct",
     ]
     return agg[keep].dropna(subset=["velo", "ivb_in", "hb_as_in"])
+
+
+def engineer_pitch_features(df: pd.DataFrame, ivb_sign: int) -> pd.DataFrame:
+    have = [c for c in FEATURE_COLS if c in df.columns]
+    df = _add_pitch_flags(df[have].copy(), ivb_sign)
+
+    grp = df.groupby(GROUP_KEYS, as_index=False)
+    agg = grp.agg(
+        n=("pitch_type", "size"),
+        **{out: (src, "mean") for out, src in _MEAN_COLS.items()},
+        **{out: (src, "sum") for out, src in _SUM_COLS.items()},
+    )
+    return _finalize_features(agg)
+
+
+class _MedianSign:
+    """
+    One-pass sign of the median of a stream of values, in O(1) memory.
+    Only the sign matters for `infer_ivb_sign`, so counting negatives decides it;
+    when exactly half are negative the median straddles zero and the two middle
+    values (largest negative, smallest non-negative) settle it. Matches
+    `pd.Series.median() < 0` exactly.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.n_neg = 0
+        self.max_neg = -np.inf
+        self.min_nonneg = np.inf
+
+    def update(self, values: pd.Series) -> None:
+        v = values.dropna().to_numpy(dtype=float)
+        neg = v[v < 0]
+        nonneg = v[v >= 0]
+        self.n += v.size
+        self.n_neg += neg.size
+        if neg.size:
+            self.max_neg = max(self.max_neg, neg.max())
+        if nonneg.size:
+            self.min_nonneg = min(self.min_nonneg, nonneg.min())
+
+    def sign(self) -> int:
+        if self.n == 0:
+            return -1
+        if 2 * self.n_neg != self.n:
+            return -1 if 2 * self.n_neg > self.n else +1
+        return -1 if self.max_neg + self.min_nonneg < 0 else +1
+
+
+def _partial_aggregate(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-group sums/counts for one batch; they add up across batches."""
+    grp = df.groupby(GROUP_KEYS)
+    parts = {"n": grp.size()}
+    for out, src in _MEAN_COLS.items():
+        parts[f"{out}_sum"] = grp[src].sum()
+        parts[f"{out}_cnt"] = grp[src].count()
+    for out, src in _SUM_COLS.items():
+        parts[out] = grp[src].sum()
+    return pd.DataFrame(parts)
+
+
+def stream_pitch_features(
+    paths, ivb_sign: int | None = None, batch_size: int = 65_536
+) -> tuple[pd.DataFrame, int]:
+    """
+    Bounded-memory `engineer_pitch_features` over cached Statcast parquet
+    file(s), read `batch_size` rows at a time (one path per date partition is
+    fine). Per-batch partial aggregates are folded into a running total keyed
+    by (player_name, pitch_type, p_throws), so peak memory depends on the batch
+    size, not on the length of the history.
+
+    IVB is accumulated unsigned and the sign applied at the end, so the median
+    for `infer_ivb_sign` is gathered in the same single pass.
+    Returns (df_feat, ivb_sign).
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+
+    median = _MedianSign()
+    total = None
+    for path in paths:
+        pf = pq.ParquetFile(path)
+        cols = [c for c in _STREAM_COLS if c in pf.schema_arrow.names]
+        for batch in pf.iter_batches(batch_size=batch_size, columns=cols):
+            df = batch.to_pandas()
+            if "pfx_z" in df.columns:
+                median.update(df["pfx_z"])
+            part = _partial_aggregate(_add_pitch_flags(df, +1))
+            total = part if total is None else total.add(part, fill_value=0)
+
+    if ivb_sign is None:
+        ivb_sign = median.sign()
+    if total is None:
+        empty = pd.DataFrame(columns=_STREAM_COLS)
+        return engineer_pitch_features(empty, ivb_sign), ivb_sign
+
+    agg = pd.DataFrame({"n": total["n"].astype(int)}, index=total.index)
+    for out in _MEAN_COLS:
+        cnt = total[f"{out}_cnt"]
+        agg[out] = total[f"{out}_sum"] / cnt.where(cnt > 0)
+    agg["ivb_in"] *= ivb_sign
+    for out in _SUM_COLS:
+        agg[out] = total[out].astype(int)
+    return _finalize_features(agg.reset_index()), ivb_sign
@@ -32,6 +32,18 @@ def fit_kmeans(df_feat: pd.DataFrame, k: int = 8, random_state: int = 42):
     return df, scaler, km, nn
 
 
+def fit_neighbors(df_fit: pd.DataFrame):
+    """
+    Rebuild the scaler + comps index for an already-clustered frame (e.g. one
+    mapped from the feature store) without re-running KMeans.
+    """
+    scaler = StandardScaler()
+    Xs = scaler.fit_transform(df_fit[ARCH_FEATURES].values)
+    nn = NearestNeighbors(n_neighbors=6, metric="euclidean")
+    nn.fit(Xs)
+    return scaler, nn
+
+
 def nearest_comps(
     row: pd.Series, df_fit: pd.DataFrame, scaler, nn, within_pitch_type=True, k=6
 ):
@@ -0,0 +1,139 @@
+from __future__ import annotations
+import fcntl
+import threading
+import time
+from datetime import datetime, timezone
+from data import statcast_cache_path, default_window
+from featurize import stream_pitch_features
+from model import fit_kmeans
+from tags import xy_cluster_tags
+from store import (
+    publish_frames,
+    read_manifest,
+    default_manifest,
+    fit_frame_name,
+    window_dir,
+    set_default_window,
+)
+
+REFRESH_INTERVAL = 24 * 3600  # seconds between scheduled rebuilds
+RETRY_BACKOFF = 15 * 60  # seconds before retrying a failed rebuild
+
+
+def build_snapshot(start: str, end: str, k: int = 8, force: bool = False) -> dict:
+    """
+    Full rebuild for one default window: Statcast cache → features →
+    clusters/tags, published to the feature store as a single snapshot
+    (flagged "default" so it may be pruned once superseded). Returns the
+    manifest.
+    """
+    cp = statcast_cache_path(start, end, force=force)
+    df_feat, ivb_sign = stream_pitch_features(cp)
+    if df_feat.empty:
+        raise ValueError(f"No pitches for {start} → {end}")
+    df_fit, scaler, km, nn = fit_kmeans(df_feat, k=k)
+    df_fit["cluster_name"] = df_fit["cluster"].map(xy_cluster_tags(df_fit))
+    return publish_frames(
+        start,
+        end,
+        {"feat": df_feat, fit_frame_name(k): df_fit},
+        replace=True,
+        ivb_sign=ivb_sign,
+        k=k,
+        default=True,
+    )
+
+
+def snapshot_age(manifest: dict | None) -> float:
+    """Seconds since the snapshot's data was built (inf if unknown)."""
+    if not manifest or "as_of" not in manifest:
+        return float("inf")
+    as_of = datetime.fromisoformat(manifest["as_of"])
+    return (datetime.now(timezone.utc) - as_of).total_seconds()
+
+
+class RefreshWorker:
+    """
+    Daemon thread that rebuilds the snapshot for `window()` (default: the
+    dashboard's default window) off the request path: when it is missing or
+    older than `interval`, or on `request()`. Readers keep mapping the last
+    published snapshot until the new manifest lands. A file lock keeps
+    processes sharing the store from rebuilding the same window at once.
+    """
+
+    def __init__(self, window=default_window, k: int = 8, interval=REFRESH_INTERVAL):
+        self.window = window
+        self.k = k
+        self.interval = interval
+        self.running = False
+        self.last_error: str | None = None
+        self.last_attempt: float | None = None
+        self._wake = threading.Event()
+        self._force = False
+        self._thread = threading.Thread(target=self._loop, name="refresh", daemon=True)
+        self._thread.start()
+
+    def request(self, force: bool = False) -> None:
+        """Ask for a rebuild now; `force` re-downloads Statcast."""
+        self._force = self._force or force
+        self._wake.set()
+
+    def _age(self) -> float:
+        """Age of the snapshot the app is actually serving (via the pointer)."""
+        served = default_manifest(self.window()[0])
+        return snapshot_age(served[1] if served else None)
+
+    def _adopt(self) -> bool:
+        """
+        Point the default window at a fresh snapshot someone else published
+        for it (e.g. a no-argument CLI run) instead of rebuilding it.
+        """
+        start, end = self.window()
+        served = default_manifest(start)
+        if served is not None and served[0] == end:
+            return False  # already serving it: a rebuild was asked for
+        if snapshot_age(read_manifest(start, end)) >= self.interval:
+            return False
+        set_default_window(start, end)
+        return True
+
+    def _loop(self):
+        while True:
+            # never let an exception end the thread: record it and back off
+            try:
+                if self._wake.is_set() or self._age() >= self.interval:
+                    force, self._force = self._force, False
+                    self._wake.clear()
+                    if force or not self._adopt():
+                        self._refresh(force)
+                timeout = self._next_check()
+            except Exception as e:
+                self.running = False
+                self.last_error = str(e)
+                timeout = min(self.interval, RETRY_BACKOFF)
+            self._wake.wait(timeout=timeout)
+
+    def _next_check(self) -> float:
+        age = self._age()
+        if self.last_error or age == float("inf"):
+            # last build failed, or another process is still building: back off
+            return min(self.interval, RETRY_BACKOFF)
+        return max(self.interval - age, 60)
+
+    def _refresh(self, force: bool):
+        start, end = self.window()
+        wd = window_dir(start, end)
+        wd.mkdir(parents=True, exist_ok=True)
+        with open(wd / ".refresh.lock", "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return  # another process is rebuilding this window
+            self.running = True
+            self.last_attempt = time.time()
+            try:
+                build_snapshot(start, end, k=self.k, force=force)
+                set_default_window(start, end)
+                self.last_error = None
+            finally:
+                self.running = False
@@ -0,0 +1,190 @@
+from __future__ import annotations
+import fcntl
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+from utils import ARTIFACTS_DIR
+
+STORE_DIR = ARTIFACTS_DIR / "store"
+MANIFEST = "manifest.json"
+
+
+def window_dir(start: str, end: str) -> Path:
+    return STORE_DIR / f"{start}_{end}"
+
+
+def _to_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Build an Arrow table that maps back to pandas without copying.
+    Float NaN is kept as NaN (not converted to null) so numeric columns have
+    no validity bitmap and can be viewed straight out of the mapped pages.
+    """
+    arrays, names = [], []
+    for c in df.columns:
+        s = df[c]
+        if pd.api.types.is_float_dtype(s.dtype):
+            arrays.append(pa.array(s.to_numpy(), from_pandas=False))
+        else:
+            arrays.append(pa.array(s, from_pandas=True))
+        names.append(str(c))
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def _write_ipc(df: pd.DataFrame, path: Path) -> None:
+    """Uncompressed Arrow IPC file, written to a temp name then renamed into place."""
+    tmp = path.with_name(path.name + ".tmp")
+    table = _to_arrow(df)
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+
+def read_manifest(start: str, end: str) -> dict | None:
+    mp = window_dir(start, end) / MANIFEST
+    if not mp.exists():
+        return None
+    with open(mp) as f:
+        return json.load(f)
+
+
+def publish_frames(
+    start: str,
+    end: str,
+    frames: dict[str, pd.DataFrame],
+    replace: bool = False,
+    build: str | None = None,
+    **meta,
+) -> dict | None:
+    """
+    Write named frames for a window as one snapshot and publish it atomically.
+    Frames from the previous snapshot are carried over unless `replace` is set
+    (use it when the underlying data changed, so stale fits are dropped; this
+    also starts a new "build" and stamps its "as_of").
+    Pass the `build` the frames were derived from to add to an existing
+    snapshot; if the data has been rebuilt since, nothing is published and
+    None is returned.
+    The manifest is swapped last, so readers see either the old or the new
+    snapshot, never a mix.
+    """
+    wd = window_dir(start, end)
+    wd.mkdir(parents=True, exist_ok=True)
+    # one publisher per window at a time, so carried-over files and pruning
+    # never race a concurrent rebuild (across threads and processes)
+    with open(wd / ".manifest.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        version = f"{time.time_ns():x}"
+        prev = {} if replace else (read_manifest(start, end) or {})
+        if build is not None and prev.get("build") != build:
+            return None
+        if replace:
+            now = datetime.now(timezone.utc)
+            meta.setdefault("as_of", now.isoformat(timespec="seconds"))
+            meta["build"] = version
+
+        files = dict(prev.get("files", {}))
+        for name, df in frames.items():
+            fname = f"{name}-{version}.arrow"
+            _write_ipc(df, wd / fname)
+            files[name] = fname
+
+        manifest = {
+            **{k: v for k, v in prev.items() if k not in ("files", "version")},
+            **meta,
+            "version": version,
+            "files": files,
+        }
+        tmp = wd / f"{MANIFEST}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, wd / MANIFEST)
+
+        # Old versions can go: processes that still map them keep their pages
+        # until they let go (unlinking a mapped file is safe on POSIX).
+        live = set(files.values())
+        for p in wd.glob("*.arrow"):
+            if p.name not in live:
+                p.unlink(missing_ok=True)
+    return manifest
+
+
+def _default_pointer(start: str) -> Path:
+    return STORE_DIR / "default" / f"{start}.json"
+
+
+def _read_pointer(start: str) -> dict | None:
+    pointer = _default_pointer(start)
+    if not pointer.exists():
+        return None
+    with open(pointer) as f:
+        return json.load(f)
+
+
+def default_manifest(start: str) -> tuple[str, dict] | None:
+    """
+    Snapshot currently serving the default window beginning at `start`, as
+    (end, manifest). The default window ends "today", so this pointer is how
+    the last good build keeps being served after the date rolls over; only
+    the refresh worker moves it, so custom windows never take its place.
+    """
+    pointer = _read_pointer(start)
+    if pointer is None:
+        return None
+    manifest = read_manifest(start, pointer["end"])
+    return (pointer["end"], manifest) if manifest else None
+
+
+def set_default_window(start: str, end: str) -> None:
+    """
+    Point the default window at the snapshot published for (start, end).
+    The window it replaces is kept for one more cycle, since sessions may
+    still be about to map it; the one before that is dropped if the refresh
+    worker built it (snapshots published for custom windows are left alone).
+    """
+    pointer = _default_pointer(start)
+    pointer.parent.mkdir(parents=True, exist_ok=True)
+    prev = _read_pointer(start) or {}
+    if prev.get("end") == end:
+        return
+    tmp = pointer.with_name(f"{pointer.name}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump({"end": end, "prev_end": prev.get("end")}, f, indent=2)
+    os.replace(tmp, pointer)
+
+    stale = prev.get("prev_end")
+    if stale and stale != end and (read_manifest(start, stale) or {}).get("default"):
+        shutil.rmtree(window_dir(start, stale), ignore_errors=True)
+
+
+def stored_path(
+    start: str, end: str, name: str, manifest: dict | None = None
+) -> Path | None:
+    """Path of a named frame in the current snapshot, or None if not stored."""
+    manifest = manifest or read_manifest(start, end)
+    if not manifest or name not in manifest.get("files", {}):
+        return None
+    path = window_dir(start, end) / manifest["files"][name]
+    return path if path.exists() else None
+
+
+def map_frame(path: str | Path) -> pd.DataFrame:
+    """
+    Memory-map a stored frame read-only and build a DataFrame over it.
+    Pages live in the OS page cache and are shared by every process mapping the
+    same file; numeric columns are zero-copy views, strings use Arrow-backed dtype.
+    """
+    source = pa.memory_map(str(path), "r")
+    table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(
+        split_blocks=True,
+        types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get,
+    )
+
+
+def fit_frame_name(k: int) -> str:
+    return f"fit_k{k}"
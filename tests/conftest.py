@@ -0,0 +1,5 @@
+import os
+import sys
+
+# modules under src/ are imported flat (same as app.py / bin/cli.py)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
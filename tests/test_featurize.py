@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from featurize import (
+    GROUP_KEYS,
+    _MedianSign,
+    engineer_pitch_features,
+    infer_ivb_sign,
+    stream_pitch_features,
+)
+
+
+def _synthetic_statcast(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "pitch_type": rng.choice(["FF", "SL", "CH", "CU", None], n),
+            "player_name": rng.choice([f"Pitcher {i}" for i in range(40)], n),
+            "events": rng.choice(["groundout", "single", "strikeout", None], n),
+            "description": rng.choice(
+                ["called_strike", "swinging_strike", "foul", "hit_into_play", "ball"],
+                n,
+            ),
+            "p_throws": rng.choice(["R", "L"], n),
+            "release_pos_x": rng.normal(-1.5, 1.0, n),
+            "release_pos_z": rng.normal(5.8, 0.4, n),
+            "pfx_x": rng.normal(0.0, 0.8, n),
+            "pfx_z": np.where(rng.random(n) < 0.02, np.nan, rng.normal(-0.5, 0.6, n)),
+            "release_speed": rng.normal(90.0, 5.0, n),
+            "release_spin_rate": np.where(
+                rng.random(n) < 0.05, np.nan, rng.normal(2300.0, 200.0, n)
+            ),
+        }
+    )
+
+
+@pytest.mark.parametrize("batch_size", [997, 4096, 50_000])
+def test_stream_matches_in_memory(tmp_path, batch_size):
+    df = _synthetic_statcast(20_000)
+    path = tmp_path / "statcast.parquet"
+    df.to_parquet(path, index=False, row_group_size=3_000)
+
+    ivb_sign = infer_ivb_sign(df)
+    expected = engineer_pitch_features(df, ivb_sign)
+    got, got_sign = stream_pitch_features(path, batch_size=batch_size)
+
+    assert got_sign == ivb_sign
+    expected = expected.sort_values(GROUP_KEYS).reset_index(drop=True)
+    got = got.sort_values(GROUP_KEYS).reset_index(drop=True)
+    pd.testing.assert_frame_equal(got, expected, rtol=1e-9)
+
+
+def test_stream_over_date_partitions(tmp_path):
+    df = _synthetic_statcast(9_000, seed=1)
+    paths = []
+    for i, lo in enumerate(range(0, len(df), 3_000)):
+        paths.append(tmp_path / f"part{i}.parquet")
+        df.iloc[lo : lo + 3_000].to_parquet(paths[-1], index=False)
+
+    expected = engineer_pitch_features(df, infer_ivb_sign(df))
+    got, _ = stream_pitch_features(paths, batch_size=1_000)
+    pd.testing.assert_frame_equal(
+        got.sort_values(GROUP_KEYS).reset_index(drop=True),
+        expected.sort_values(GROUP_KEYS).reset_index(drop=True),
+        rtol=1e-9,
+    )
+
+
+def test_median_sign_matches_pandas():
+    rng = np.random.default_rng(2)
+    for _ in range(2_000):
+        values = pd.Series(rng.choice([-3.0, -1.0, 0.0, 1.0, 2.0, np.nan], 7))
+        sketch = _MedianSign()
+        sketch.update(values.iloc[:3])
+        sketch.update(values.iloc[3:])
+        assert sketch.sign() == infer_ivb_sign(pd.DataFrame({"pfx_z": values}))
@@ -0,0 +1,134 @@
+import fcntl
+import time
+import pandas as pd
+import pytest
+import refresh
+import store
+
+
+@pytest.fixture(autouse=True)
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "STORE_DIR", tmp_path / "store")
+    return tmp_path / "store"
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Stub the Statcast → features → KMeans chain; record each build."""
+    calls = []
+
+    def fake_build(start, end, k=8, force=False):
+        calls.append((start, end, force))
+        feat = pd.DataFrame({"player_name": ["A"], "velo": [90.0]})
+        return store.publish_frames(
+            start,
+            end,
+            {"feat": feat, store.fit_frame_name(k): feat},
+            replace=True,
+            default=True,
+        )
+
+    monkeypatch.setattr(refresh, "build_snapshot", fake_build)
+    return calls
+
+
+def _wait_for(cond, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if cond():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_first_build_sets_default_pointer(builds):
+    window = ["2025-03-01", "2025-10-19"]
+    worker = refresh.RefreshWorker(lambda: tuple(window), interval=3600)
+
+    assert _wait_for(lambda: store.default_manifest("2025-03-01") is not None)
+    assert builds == [("2025-03-01", "2025-10-19", False)]
+    assert worker.last_error is None
+
+    # a custom window with the same start never takes over the default view
+    custom = {"feat": pd.DataFrame()}
+    store.publish_frames("2025-03-01", "2025-04-15", custom, replace=True)
+    assert store.default_manifest("2025-03-01")[0] == "2025-10-19"
+
+
+def test_adopts_fresh_cli_snapshot_instead_of_rebuilding(builds):
+    # what a no-argument `pitchxy` run publishes for default_window()
+    cli = {"feat": pd.DataFrame({"x": [1.0]})}
+    store.publish_frames("2025-03-01", "2025-10-19", cli, replace=True)
+    worker = refresh.RefreshWorker(lambda: ("2025-03-01", "2025-10-19"), interval=3600)
+
+    assert _wait_for(lambda: store.default_manifest("2025-03-01") is not None)
+    assert builds == []
+    assert worker.last_error is None
+    assert worker._age() < 3600
+
+
+def test_forced_request_rebuilds_served_window(builds):
+    worker = refresh.RefreshWorker(lambda: ("2025-03-01", "2025-10-19"), interval=3600)
+    assert _wait_for(lambda: len(builds) == 1)
+
+    worker.request(force=True)
+    assert _wait_for(lambda: len(builds) == 2)
+    assert builds[-1][2] is True
+
+
+def test_rollover_keeps_previous_window_for_one_cycle(builds, store_dir):
+    window = ["2025-03-01", "2025-10-17"]
+    worker = refresh.RefreshWorker(lambda: tuple(window), interval=3600)
+    assert _wait_for(lambda: len(builds) == 1)
+
+    for day in ["2025-10-18", "2025-10-19", "2025-10-20"]:
+        window[1] = day
+        worker.request(force=True)
+        assert _wait_for(lambda: store.default_manifest("2025-03-01")[0] == day)
+        assert _wait_for(lambda: not worker.running)
+
+    # current and previous windows survive; older worker-built ones are pruned
+    dirs = {p.name for p in store_dir.glob("2025-03-01_*")}
+    assert dirs == {"2025-03-01_2025-10-19", "2025-03-01_2025-10-20"}
+
+
+def test_custom_snapshot_is_not_pruned(builds, store_dir):
+    cli = {"feat": pd.DataFrame()}
+    store.publish_frames("2025-03-01", "2025-10-17", cli, replace=True)
+    window = ["2025-03-01", "2025-10-17"]
+    worker = refresh.RefreshWorker(lambda: tuple(window), interval=3600)
+    assert _wait_for(lambda: store.default_manifest("2025-03-01") is not None)
+    assert builds == []  # adopted the CLI snapshot
+
+    for day in ["2025-10-18", "2025-10-19"]:
+        window[1] = day
+        worker.request(force=True)
+        assert _wait_for(lambda: store.default_manifest("2025-03-01")[0] == day)
+
+    assert (store_dir / "2025-03-01_2025-10-17" / store.MANIFEST).exists()
+
+
+def test_lock_contention_skips_build(builds, store_dir):
+    wd = store.window_dir("2025-03-01", "2025-10-19")
+    wd.mkdir(parents=True)
+    with open(wd / ".refresh.lock", "w") as held:
+        fcntl.flock(held, fcntl.LOCK_EX)  # another process is rebuilding
+        worker = refresh.RefreshWorker(
+            lambda: ("2025-03-01", "2025-10-19"), interval=3600
+        )
+        time.sleep(0.3)
+        assert builds == []
+        assert worker.last_error is None
+        assert not worker.running
+
+
+def test_failures_are_recorded_and_thread_survives(monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("statcast down")
+
+    monkeypatch.setattr(refresh, "build_snapshot", broken)
+    worker = refresh.RefreshWorker(lambda: ("2025-03-01", "2025-10-19"), interval=3600)
+
+    assert _wait_for(lambda: worker.last_error == "statcast down")
+    assert worker._thread.is_alive()
+    assert worker._next_check() == refresh.RETRY_BACKOFF
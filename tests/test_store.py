@@ -0,0 +1,82 @@
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+import store
+
+
+@pytest.fixture(autouse=True)
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "STORE_DIR", tmp_path / "store")
+    return tmp_path / "store"
+
+
+def _frame(n: int = 50, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    velo = rng.normal(90.0, 5.0, n)
+    velo[::7] = np.nan
+    return pd.DataFrame(
+        {
+            "player_name": rng.choice(["A", "B", None], n),
+            "pitch_type": rng.choice(["FF", "SL"], n),
+            "n": rng.integers(1, 500, n),
+            "velo": velo,
+            "cluster": rng.integers(0, 8, n).astype("int32"),
+        }
+    )
+
+
+def test_round_trip_is_zero_copy():
+    df = _frame()
+    manifest = store.publish_frames("s", "e", {"feat": df}, replace=True)
+    out = store.map_frame(store.stored_path("s", "e", "feat", manifest))
+
+    assert isinstance(out["player_name"].dtype, pd.StringDtype)
+    assert out["player_name"].isna().tolist() == df["player_name"].isna().tolist()
+    for col in ["n", "velo", "cluster"]:
+        assert out[col].dtype == df[col].dtype
+        assert not out[col].to_numpy(copy=False).flags.writeable  # mapped view
+    np.testing.assert_array_equal(out["velo"].to_numpy(), df["velo"].to_numpy())
+
+
+def test_stale_build_is_rejected():
+    old = store.publish_frames("s", "e", {"feat": _frame()}, replace=True)
+    new = store.publish_frames("s", "e", {"feat": _frame(seed=1)}, replace=True)
+
+    stale = store.publish_frames("s", "e", {"fit_k8": _frame()}, build=old["build"])
+    assert stale is None
+    assert store.read_manifest("s", "e") == new
+
+    added = store.publish_frames("s", "e", {"fit_k8": _frame()}, build=new["build"])
+    assert added["build"] == new["build"]
+    assert set(added["files"]) == {"feat", "fit_k8"}
+
+
+def test_old_versions_are_pruned(store_dir):
+    frames = {"feat": _frame(), "fit_k8": _frame()}
+    first = store.publish_frames("s", "e", frames, replace=True)
+    second = store.publish_frames("s", "e", {"feat": _frame(seed=1)}, replace=True)
+
+    on_disk = {p.name for p in (store_dir / "s_e").glob("*.arrow")}
+    assert on_disk == set(second["files"].values())
+    assert store.stored_path("s", "e", "fit_k8") is None
+    assert store.stored_path("s", "e", "feat", first) is None
+
+
+def test_concurrent_fit_publishes_are_not_lost():
+    base = store.publish_frames("s", "e", {"feat": _frame()}, replace=True)
+
+    def publish(k):
+        frames = {f"fit_k{k}": _frame(seed=k)}
+        store.publish_frames("s", "e", frames, build=base["build"])
+
+    threads = [threading.Thread(target=publish, args=(k,)) for k in range(5, 13)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    files = store.read_manifest("s", "e")["files"]
+    assert set(files) == {"feat"} | {f"fit_k{k}" for k in range(5, 13)}
+    for name in files:
+        assert store.stored_path("s", "e", name) is not None